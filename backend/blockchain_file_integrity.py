@@ -1,66 +1,175 @@
+import atexit
 import hashlib
 import json
+import ssl
 import time
 import os
+import signal
 import sys
+import threading
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
+import orjson
+
 # --- Fix for Windows console Unicode errors ---
 # Forces stdout to use UTF-8 (so symbols or emojis won't crash)
 sys.stdout.reconfigure(encoding='utf-8')
 
+# Optional compiled nonce scanner (requires numba + numpy). Opt-in with
+# BLOCKCHAIN_POW_KERNEL=numba: on SHA-NI CPUs the hashlib midstate loop is faster.
+pow_kernel = None
+if os.environ.get("BLOCKCHAIN_POW_KERNEL") == "numba":
+    try:
+        import pow_kernel
+    except ImportError as _e:
+        print("[⚠️] Numba nonce scanner unavailable:", _e)
+        pow_kernel = None
+    if pow_kernel is not None:
+        try:
+            # Compiles the kernel now and checks it against hashlib before first use
+            if not pow_kernel.self_check():
+                print("[⚠️] Numba nonce scanner disagrees with hashlib; using the Python miner")
+                pow_kernel = None
+        except Exception as _e:
+            # Typing, lowering or LLVM errors from a numba/numpy mismatch surface here
+            print("[⚠️] Numba nonce scanner failed to compile; using the Python miner:", _e)
+            pow_kernel = None
+
 # --- Configuration ---
 HASH_ALGORITHM = "sha256"
-BLOCKCHAIN_FILE = "blockchain_data.json"
+BLOCKCHAIN_FILE = "blockchain_data.jsonl"  # Header line + one block per line
+LEGACY_BLOCKCHAIN_FILE = "blockchain_data.json"  # Pre-JSONL format, migrated on load
 DEMO_FILE_PATH = "important_document.txt"
-MINING_DIFFICULTY = 2  # Number of leading zeros required
+MINING_DIFFICULTY = 2  # Number of leading zeros required (starting point; adjusted while mining)
+MIN_MINE_SECONDS = 0.05  # Raise difficulty when recent blocks mine faster than this on average
+MAX_MINE_SECONDS = 1.0  # Lower difficulty when recent blocks mine slower than this on average
+FLUSH_DELAY_SECONDS = 0.5  # Background saves wait this long to coalesce bursts of new blocks
+HASH_CHUNK_SIZE = 1024 * 1024  # Bytes read per readinto() when hashing files
+
+
+def new_hash(data: bytes = b""):
+    """Create a SHA-256 object flagged as non-security use (skips FIPS-mode checks)."""
+    return hashlib.new(HASH_ALGORITHM, data, usedforsecurity=False)
+
+
+def describe_hash_backend() -> str:
+    """Report which OpenSSL build backs hashlib and whether the CPU has SHA-NI."""
+    sha_ni = "unknown"
+    try:
+        with open("/proc/cpuinfo", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("flags"):
+                    sha_ni = "yes" if "sha_ni" in line.split() else "no"
+                    break
+    except OSError:
+        pass
+    miner = "numba" if pow_kernel is not None else "python"
+    return f"{ssl.OPENSSL_VERSION} | SHA-NI: {sha_ni} | Miner: {miner}"
+
+
+def meets_difficulty(digest: bytes, difficulty: int) -> bool:
+    """Check a raw digest for `difficulty` leading zero hex digits."""
+    zero_bytes, odd = divmod(difficulty, 2)
+    if digest[:zero_bytes] != bytes(zero_bytes):
+        return False
+    return not odd or digest[zero_bytes] < 0x10
 
 
 class Block:
     """Represents a single block in the blockchain, storing file metadata."""
 
-    def __init__(self, index: int, previous_hash: str, timestamp: float, data: Dict[str, Any], difficulty: int = 0):
+    __slots__ = (
+        'index', 'timestamp', 'data', 'previous_hash', 'nonce', 'difficulty', 'hash',
+        '_ts_str', '_canonical_bytes'
+    )
+
+    def __init__(self, index: int, previous_hash: str, timestamp: float, data: Dict[str, Any], difficulty: int = 0,
+                 nonce: Optional[int] = None, block_hash: Optional[str] = None):
         self.index = index
         self.timestamp = timestamp
         self.data = data
         self.previous_hash = previous_hash
-        self.nonce = 0
+        self.nonce = 0 if nonce is None else nonce
         self.difficulty = difficulty
         self.hash = ""
-
-        # Mine the block if difficulty is set
-        if difficulty > 0:
+        self._ts_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp))  # Display form of timestamp
+        self._canonical_bytes = b""  # Hashed bytes for the final nonce, reused by validation
+
+        if block_hash is not None:
+            # Restoring a stored block: keep its nonce and hash, don't mine or re-hash
+            self._canonical_bytes = self._canonical()
+            self.hash = block_hash
+        elif difficulty > 0:
+            # Mine the block if difficulty is set
             self.mine_block()
         else:
-            self.hash = self.calculate_hash()
+            self._seal()
+
+    def _seal(self):
+        """Cache the canonical bytes for the current nonce and set the block hash."""
+        self._canonical_bytes = self._canonical()
+        self.hash = new_hash(self._canonical_bytes).hexdigest()
+
+    def _header_parts(self) -> Tuple[bytes, bytes]:
+        """Serialize the block contents as the bytes before and after the nonce.
+
+        The layout is exactly json.dumps(..., sort_keys=True) of the hashed
+        fields, so existing chains keep their hashes. Keys sort as data,
+        index, nonce, previous_hash, timestamp; mining only re-encodes the
+        nonce between the two parts.
+        """
+        prefix = f'{{"data": {json.dumps(self.data, sort_keys=True)}, "index": {self.index}, "nonce": '
+        suffix = f', "previous_hash": {json.dumps(self.previous_hash)}, "timestamp": {self.timestamp!r}}}'
+        return prefix.encode(), suffix.encode()
+
+    def _canonical(self) -> bytes:
+        """Canonical byte layout of the current block contents."""
+        prefix, suffix = self._header_parts()
+        return prefix + str(self.nonce).encode() + suffix
 
     def calculate_hash(self) -> str:
         """Calculates the hash for the current block's contents."""
-        block_string = json.dumps({
-            "index": self.index,
-            "timestamp": self.timestamp,
-            "data": self.data,
-            "previous_hash": self.previous_hash,
-            "nonce": self.nonce
-        }, sort_keys=True).encode()
+        return self.calculate_digest().hex()
 
-        return hashlib.sha256(block_string).hexdigest()
+    def calculate_digest(self) -> bytes:
+        """Calculates the raw SHA-256 digest of the current block's contents."""
+        return new_hash(self._canonical()).digest()
 
     def mine_block(self):
         """Proof-of-work mining: find a hash with required leading zeros."""
-        target = "0" * self.difficulty
         print(f"[⛏️] Mining block {self.index}... (difficulty: {self.difficulty})", end="", flush=True)
 
         start_time = time.time()
+        prefix, suffix = self._header_parts()
+        if pow_kernel is not None:
+            self.nonce = pow_kernel.find_nonce(prefix, suffix, self.difficulty)
+        else:
+            self.nonce = self._find_nonce(prefix, suffix)
+        self._seal()
+        elapsed = time.time() - start_time
+        print(f" ✓ Mined in {elapsed:.2f}s (nonce: {self.nonce})")
+
+    def _find_nonce(self, prefix: bytes, suffix: bytes) -> int:
+        """Pure-Python nonce search used when the compiled kernel is unavailable."""
+        # Hash the constant prefix once and reuse its state for every nonce
+        midstate = new_hash(prefix)
+
+        # Leading-zero target as whole zero bytes plus an optional zero nibble
+        zero_bytes, odd = divmod(self.difficulty, 2)
+        zero_prefix = bytes(zero_bytes)
+
+        nonce = 0
         while True:
-            self.hash = self.calculate_hash()
-            if self.hash[:self.difficulty] == target:
-                elapsed = time.time() - start_time
-                print(f" ✓ Mined in {elapsed:.2f}s (nonce: {self.nonce})")
-                break
-            self.nonce += 1
+            h = midstate.copy()
+            h.update(str(nonce).encode() + suffix)
+            digest = h.digest()
+            if digest[:zero_bytes] == zero_prefix and (not odd or digest[zero_bytes] < 0x10):
+                return nonce
+            nonce += 1
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert block to dictionary for serialization."""
@@ -77,27 +186,24 @@ class Block:
     @staticmethod
     def from_dict(block_dict: Dict[str, Any]) -> 'Block':
         """Create block from dictionary using standard initialization."""
-        # Create a new instance with default values
-        block = Block(
+        # The stored nonce already satisfies the difficulty, so the block is restored as-is
+        return Block(
             index=block_dict["index"],
             previous_hash=block_dict["previous_hash"],
             timestamp=block_dict["timestamp"],
             data=block_dict["data"],
-            difficulty=block_dict.get("difficulty", 0)
+            difficulty=block_dict.get("difficulty", 0),
+            nonce=block_dict["nonce"],
+            block_hash=block_dict["hash"]
         )
-        # Set the nonce and hash from the dictionary
-        block.nonce = block_dict["nonce"]
-        block.hash = block_dict["hash"]
-        return block
 
     def __repr__(self) -> str:
         """Readable representation of the block data."""
-        dt = datetime.fromtimestamp(self.timestamp).strftime("%Y-%m-%d %H:%M:%S")
         return (
             f"\n{'='*60}\n"
             f"Block #{self.index}\n"
             f"{'='*60}\n"
-            f"Timestamp:     {dt}\n"
+            f"Timestamp:     {self._ts_str}\n"
             f"File:          {self.data.get('filename', 'N/A')}\n"
             f"Uploader ID:   {self.data.get('uploader_id', 'N/A')}\n"
             f"Action:        {self.data.get('action', 'N/A')}\n"
@@ -117,6 +223,20 @@ class Blockchain:
         self.chain: List[Block] = []
         self.difficulty = difficulty
         self.pending_verifications: List[Dict[str, Any]] = []
+        self.chain_file = BLOCKCHAIN_FILE
+        self._saved_count = 0  # Blocks already written to chain_file
+        self._by_filename: Dict[str, List[int]] = defaultdict(list)  # filename -> positions in chain
+        self._block_summary: List[Tuple[Optional[str], str, Optional[str]]] = []  # (filename, action, uploader) per block
+        self._serialized_blocks: List[Dict[str, Any]] = []  # to_dict() of every block, for history responses
+        self._last_validated_index = 0  # Blocks up to here passed the last validation
+        self._recent_mine_times = deque(maxlen=16)  # Mining seconds of recent blocks at the current difficulty
+
+        # Guards appends and saves. New blocks are persisted by a background thread,
+        # started once this chain owns a file (after a load or a save); atexit
+        # flushes whatever is left
+        self._save_lock = threading.RLock()
+        self._dirty = threading.Event()
+        self._flusher_started = False
 
     def create_genesis_block(self):
         """Creates the initial block of the chain (index 0)."""
@@ -134,6 +254,8 @@ class Blockchain:
             difficulty=0
         )
         self.chain.append(genesis_block)
+        self._block_summary.append(self._summarize(genesis_block))
+        self._serialized_blocks.append(genesis_block.to_dict())
         print("\n[🔗] Blockchain initialized with Genesis Block")
 
     def get_latest_block(self) -> Block:
@@ -142,47 +264,110 @@ class Blockchain:
 
     def add_block(self, file_data: Dict[str, Any]) -> bool:
         """Creates a new block containing file metadata and adds it to the chain."""
-        try:
-            latest_block = self.get_latest_block()
-            new_index = latest_block.index + 1
-            new_timestamp = time.time()
-
-            new_block = Block(
-                index=new_index,
-                previous_hash=latest_block.hash,
-                timestamp=new_timestamp,
-                data=file_data,
-                difficulty=self.difficulty
-            )
-
-            self.chain.append(new_block)
-            print(f"[✅] Block {new_index} added: {file_data.get('action', 'ACTION')} - {file_data['filename']}")
-            return True
+        # Mining and appending happen under the chain lock so concurrent callers cannot fork the chain
+        with self._save_lock:
+            try:
+                latest_block = self.get_latest_block()
+                new_index = latest_block.index + 1
+                new_timestamp = time.time()
+
+                new_block = Block(
+                    index=new_index,
+                    previous_hash=latest_block.hash,
+                    timestamp=new_timestamp,
+                    data=file_data,
+                    difficulty=self.difficulty
+                )
+                self._adjust_difficulty(new_block.difficulty, time.time() - new_timestamp)
+
+                self.chain.append(new_block)
+                self._by_filename[file_data['filename']].append(len(self.chain) - 1)
+                self._block_summary.append(self._summarize(new_block))
+                self._serialized_blocks.append(new_block.to_dict())
+                print(f"[✅] Block {new_index} added: {file_data.get('action', 'ACTION')} - {file_data['filename']}")
+                self._dirty.set()
+                return True
+
+            except Exception as e:
+                print(f"[❌] Error adding block: {e}")
+                return False
 
-        except Exception as e:
-            print(f"[❌] Error adding block: {e}")
-            return False
+    def _adjust_difficulty(self, mined_difficulty: int, mine_seconds: float):
+        """Retarget difficulty once a full window of blocks mined at the current target is in.
+
+        The window is cleared on every retarget: each difficulty step changes
+        the expected work 16x, so older samples would skew the average.
+        """
+        if self.difficulty <= 0 or mined_difficulty != self.difficulty:
+            return
+        self._recent_mine_times.append(mine_seconds)
+        if len(self._recent_mine_times) < self._recent_mine_times.maxlen:
+            return
+        average = sum(self._recent_mine_times) / len(self._recent_mine_times)
+        if average < MIN_MINE_SECONDS or (average > MAX_MINE_SECONDS and self.difficulty > 1):
+            self._recent_mine_times.clear()
+        if average < MIN_MINE_SECONDS:
+            self.difficulty += 1
+            print(f"[⚙️] Difficulty raised to {self.difficulty} (avg mining time {average:.3f}s)")
+        elif average > MAX_MINE_SECONDS and self.difficulty > 1:
+            self.difficulty -= 1
+            print(f"[⚙️] Difficulty lowered to {self.difficulty} (avg mining time {average:.3f}s)")
+
+    @staticmethod
+    def _summarize(block: Block) -> Tuple[Optional[str], str, Optional[str]]:
+        """Fields used by get_statistics, with empty values normalized to None."""
+        data = block.data
+        return (data.get('filename') or None, data.get('action', 'UNKNOWN'), data.get('uploader_id') or None)
+
+    def _rebuild_indexes(self):
+        """Rebuild the filename index, per-block summaries and serialized blocks from the chain."""
+        self._by_filename = defaultdict(list)
+        for position, block in enumerate(self.chain):
+            filename = block.data.get('filename')
+            if filename:
+                self._by_filename[filename].append(position)
+        self._block_summary = [self._summarize(block) for block in self.chain]
+        self._serialized_blocks = [block.to_dict() for block in self.chain]
+
+    def get_serialized_blocks(self) -> List[Dict[str, Any]]:
+        """Cached to_dict() of every block in chain order; callers must not modify it."""
+        return self._serialized_blocks
 
     def find_latest_block_for_file(self, filename: str) -> Optional[Block]:
         """Find the most recent block containing a specific file."""
-        for block in reversed(self.chain):
-            if block.data.get('filename') == filename:
-                return block
-        return None
+        positions = self._by_filename.get(filename)
+        return self.chain[positions[-1]] if positions else None
 
     def get_file_history(self, filename: str) -> List[Block]:
         """Get all blocks related to a specific file."""
-        return [block for block in self.chain if block.data.get('filename') == filename]
+        return [self.chain[i] for i in self._by_filename.get(filename, [])]
 
-    def is_valid(self) -> bool:
-        """Verifies the integrity of the entire chain by checking hash links."""
+    def is_valid(self, recompute: bool = False) -> bool:
+        """Verifies the integrity of the entire chain by checking hash links.
+
+        Hashes are checked over each block's cached canonical bytes; pass
+        recompute=True to re-serialize every block from its current fields.
+        """
         print("\n[🔍] Validating blockchain integrity...")
+        return self._validate_from(1, recompute)
+
+    def is_valid_incremental(self) -> bool:
+        """Validate only the blocks added since the last successful validation."""
+        print(f"\n[🔍] Validating blocks after #{self._last_validated_index}...")
+        return self._validate_from(self._last_validated_index + 1, recompute=False)
 
-        for i in range(1, len(self.chain)):
+    def _validate_from(self, start: int, recompute: bool) -> bool:
+        # Fix the end up front; blocks appended meanwhile are left for the next check
+        end = len(self.chain)
+        for i in range(max(start, 1), end):
             current_block = self.chain[i]
             previous_block = self.chain[i - 1]
 
-            if current_block.hash != current_block.calculate_hash():
+            if recompute:
+                digest = current_block.calculate_digest()
+            else:
+                digest = new_hash(current_block._canonical_bytes).digest()
+            if current_block.hash != digest.hex():
                 print(f"[❌] VALIDATION FAILED: Block {i} hash is corrupted")
                 return False
 
@@ -191,48 +376,142 @@ class Blockchain:
                 return False
 
             if current_block.difficulty > 0:
-                target = "0" * current_block.difficulty
-                if not current_block.hash.startswith(target):
+                if not meets_difficulty(digest, current_block.difficulty):
                     print(f"[❌] VALIDATION FAILED: Block {i} doesn't meet difficulty requirement")
                     return False
 
+        self._last_validated_index = end - 1
         print("[✅] Blockchain validation successful")
         return True
 
-    def save_chain(self, filename: str = BLOCKCHAIN_FILE):
-        """Persist blockchain to disk."""
-        try:
-            chain_data = {
-                "difficulty": self.difficulty,
-                "blocks": [block.to_dict() for block in self.chain]
-            }
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(chain_data, f, indent=2)
-            print(f"[💾] Blockchain saved to '{filename}'")
+    @staticmethod
+    def _dump_line(record: Dict[str, Any]) -> bytes:
+        return orjson.dumps(record) + b"\n"
+
+    def _start_flusher(self):
+        with self._save_lock:
+            if self._flusher_started:
+                return
+            self._flusher_started = True
+        threading.Thread(target=self._flush_worker, name="blockchain-flush", daemon=True).start()
+        atexit.register(self.flush)
+
+    def _flush_worker(self):
+        while True:
+            self._dirty.wait()
+            self._dirty.clear()
+            time.sleep(FLUSH_DELAY_SECONDS)
+            self.flush()
+
+    def flush(self) -> bool:
+        """Persist blocks added since the last save, if there are any."""
+        if self._saved_count >= len(self.chain):
             return True
-        except Exception as e:
-            print(f"[❌] Error saving blockchain: {e}")
-            return False
+        return self.save_chain()
+
+    def save_chain(self, filename: Optional[str] = None) -> bool:
+        """Persist blockchain to disk, appending only blocks not yet written."""
+        with self._save_lock:
+            filename = filename or self.chain_file
+            if filename != self.chain_file or not self._saved_count or not os.path.exists(filename):
+                return self.compact(filename)
+            try:
+                blocks = self.chain[self._saved_count:]
+                with open(filename, 'ab') as f:
+                    for block in blocks:
+                        f.write(self._dump_line(block.to_dict()))
+                self._saved_count += len(blocks)
+                self._start_flusher()
+                print(f"[💾] Blockchain saved to '{filename}'")
+                return True
+            except Exception as e:
+                print(f"[❌] Error saving blockchain: {e}")
+                return False
 
-    def load_chain(self, filename: str = BLOCKCHAIN_FILE) -> bool:
+    def compact(self, filename: Optional[str] = None) -> bool:
+        """Rewrite the whole chain file atomically from the in-memory chain.
+
+        Writing to any other filename makes a one-off copy; the chain keeps
+        appending to its own file.
+        """
+        with self._save_lock:
+            filename = filename or self.chain_file
+            try:
+                blocks = list(self.chain)
+                tmp_filename = filename + ".tmp"
+                with open(tmp_filename, 'wb') as f:
+                    f.write(self._dump_line({"difficulty": self.difficulty}))
+                    for block in blocks:
+                        f.write(self._dump_line(block.to_dict()))
+                os.replace(tmp_filename, filename)
+                if filename == self.chain_file:
+                    self._saved_count = len(blocks)
+                    self._start_flusher()
+                print(f"[💾] Blockchain saved to '{filename}'")
+                return True
+            except Exception as e:
+                print(f"[❌] Error saving blockchain: {e}")
+                return False
+
+    def load_chain(self, filename: Optional[str] = None) -> bool:
         """Load blockchain from disk."""
+        filename = filename or self.chain_file
         try:
             if not os.path.exists(filename):
+                if filename == BLOCKCHAIN_FILE and os.path.exists(LEGACY_BLOCKCHAIN_FILE):
+                    return self._migrate_legacy_chain(LEGACY_BLOCKCHAIN_FILE, filename)
                 print(f"[⚠️] No existing blockchain found at '{filename}'")
                 return False
 
-            with open(filename, 'r', encoding='utf-8') as f:
-                chain_data = json.load(f)
-
-            self.difficulty = chain_data.get("difficulty", MINING_DIFFICULTY)
-            self.chain = [Block.from_dict(block_dict) for block_dict in chain_data["blocks"]]
+            with open(filename, 'rb') as f:
+                lines = [line for line in f if line.strip()]
+
+            header = orjson.loads(lines[0])
+            records = []
+            truncated = False
+            for n, line in enumerate(lines[1:], start=2):
+                try:
+                    records.append(orjson.loads(line))
+                except orjson.JSONDecodeError:
+                    # Only an interrupted append may leave a partial last line
+                    if n != len(lines):
+                        raise
+                    truncated = True
+
+            self.difficulty = header.get("difficulty", MINING_DIFFICULTY)
+            self.chain = [Block.from_dict(block_dict) for block_dict in records]
+            if len(self.chain) > 1 and self.chain[-1].difficulty > 0:
+                # The header is only rewritten on compact; resume from the latest retarget
+                self.difficulty = self.chain[-1].difficulty
+            self._rebuild_indexes()
+            self._last_validated_index = 0
+            self.chain_file = filename
+            self._saved_count = len(self.chain)
+            self._start_flusher()
 
             print(f"[📂] Blockchain loaded from '{filename}' ({len(self.chain)} blocks)")
+            if truncated:
+                print(f"[⚠️] Dropped a partially written block from '{filename}'")
+                self.compact(filename)
             return True
         except Exception as e:
             print(f"[❌] Error loading blockchain: {e}")
             return False
 
+    def _migrate_legacy_chain(self, legacy_filename: str, filename: str) -> bool:
+        """Load a chain saved as a single JSON document and rewrite it as JSONL."""
+        with open(legacy_filename, 'rb') as f:
+            chain_data = orjson.loads(f.read())
+
+        self.difficulty = chain_data.get("difficulty", MINING_DIFFICULTY)
+        self.chain = [Block.from_dict(block_dict) for block_dict in chain_data["blocks"]]
+        self._rebuild_indexes()
+        self._last_validated_index = 0
+        self.chain_file = filename
+        self._saved_count = 0
+        print(f"[📂] Blockchain loaded from '{legacy_filename}' ({len(self.chain)} blocks)")
+        return self.compact(filename)
+
     def display_chain(self):
         """Display all blocks in the chain."""
         print(f"\n{'#'*60}")
@@ -243,19 +522,12 @@ class Blockchain:
 
     def get_statistics(self) -> Dict[str, Any]:
         """Get blockchain statistics."""
-        files_tracked = set()
-        actions = {}
-        uploaders = set()
-
-        for block in self.chain[1:]:
-            filename = block.data.get('filename')
-            if filename:
-                files_tracked.add(filename)
-            action = block.data.get('action', 'UNKNOWN')
-            actions[action] = actions.get(action, 0) + 1
-            uploader = block.data.get('uploader_id')
-            if uploader:
-                uploaders.add(uploader)
+        files, actions, uploaders = zip(*self._block_summary[1:]) if len(self._block_summary) > 1 else ((), (), ())
+        files_tracked = set(files)
+        files_tracked.discard(None)
+        uploaders = set(uploaders)
+        uploaders.discard(None)
+        actions = dict(Counter(actions))
 
         return {
             "total_blocks": len(self.chain),
@@ -276,10 +548,19 @@ class FileIntegrityManager:
     def get_file_hash(filepath: str) -> Optional[str]:
         """Calculates the SHA-256 hash of a file's content."""
         try:
-            h = hashlib.sha256()
-            with open(filepath, 'rb') as file:
-                for byte_block in iter(lambda: file.read(4096), b""):
-                    h.update(byte_block)
+            h = new_hash()
+            # Read into one reused buffer; unlike a mapping, a file truncated while it is
+            # being hashed (an upload saved over the same path) just ends the loop early
+            buffer = bytearray(HASH_CHUNK_SIZE)
+            view = memoryview(buffer)
+            with open(filepath, 'rb', buffering=0) as file:
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(file.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                while True:
+                    n = file.readinto(buffer)
+                    if not n:
+                        break
+                    h.update(view[:n])
             return h.hexdigest()
         except FileNotFoundError:
             print(f"[❌] File not found: '{filepath}'")
@@ -298,17 +579,17 @@ class FileIntegrityManager:
             print(f"[❌] Error getting file metadata: {e}")
             return None
 
-    def register_file(self, filepath: str, uploader_id: str = "anonymous", action: str = "FILE_REGISTERED") -> bool:
-        """Register a new file or update existing file in blockchain."""
+    def register_file(self, filepath: str, uploader_id: str = "anonymous", action: str = "FILE_REGISTERED") -> Optional[Dict[str, Any]]:
+        """Register a new file or update existing file in blockchain; returns a copy of the recorded file data."""
         print(f"\n[📝] Registering file: '{filepath}' (Uploader: {uploader_id})")
 
         file_hash = self.get_file_hash(filepath)
         if not file_hash:
-            return False
+            return None
 
         metadata = self.get_file_metadata(filepath)
         if not metadata:
-            return False
+            return None
 
         file_data = {
             "filename": filepath,
@@ -319,7 +600,7 @@ class FileIntegrityManager:
             "timestamp": datetime.now().isoformat()
         }
 
-        return self.blockchain.add_block(file_data)
+        return dict(file_data) if self.blockchain.add_block(file_data) else None
 
     def verify_file_integrity(self, filepath: str) -> bool:
         """Verify file integrity against blockchain records."""
@@ -349,7 +630,7 @@ class FileIntegrityManager:
         print(f"   Recorded Size:  {stored_size} bytes")
         print(f"   Current Size:   {metadata['size']} bytes")
         print(f"   Block Index:    {block.index}")
-        print(f"   Block Time:     {datetime.fromtimestamp(block.timestamp).strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"   Block Time:     {block._ts_str}")
 
         if current_hash == stored_hash:
             print("\n✅ [SUCCESS] File integrity verified - No tampering detected")
@@ -358,6 +639,23 @@ class FileIntegrityManager:
             print("\n❌ [FAILURE] File integrity compromised - File has been modified!")
             return False
 
+    def verify_many(self, filepaths: List[str]) -> List[bool]:
+        """Verify several files against blockchain records, hashing them concurrently."""
+        print(f"\n[🔍] Verifying integrity of {len(filepaths)} files...")
+
+        # hashlib releases the GIL while hashing, so threads overlap disk reads and hashing
+        workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            current_hashes = list(pool.map(self.get_file_hash, filepaths))
+
+        results = []
+        for filepath, current_hash in zip(filepaths, current_hashes):
+            block = self.blockchain.find_latest_block_for_file(filepath)
+            ok = bool(block and current_hash and current_hash == block.data.get('file_hash'))
+            print(f"   {'✅' if ok else '❌'} {filepath}")
+            results.append(ok)
+        return results
+
 
 # --- Utility Functions ---
 
@@ -424,9 +722,8 @@ def interactive_mode(blockchain: Blockchain, manager: FileIntegrityManager):
             else:
                 print(f"\n📜 File History for '{filepath}':")
                 for block in history:
-                    dt = datetime.fromtimestamp(block.timestamp).strftime("%Y-%m-%d %H:%M:%S")
                     uploader = block.data.get('uploader_id', 'unknown')
-                    print(f"   Block {block.index} | {dt} | {block.data.get('action')} | Uploader: {uploader}")
+                    print(f"   Block {block.index} | {block._ts_str} | {block.data.get('action')} | Uploader: {uploader}")
 
         elif choice == "4":
             blockchain.display_chain()
@@ -502,8 +799,7 @@ def run_demo_simulation(blockchain: Blockchain, manager: FileIntegrityManager):
     print("-" * 60)
     history = blockchain.get_file_history(DEMO_FILE_PATH)
     for block in history:
-        dt = datetime.fromtimestamp(block.timestamp).strftime("%Y-%m-%d %H:%M:%S")
-        print(f"   Block {block.index} | {dt} | {block.data.get('action')} | Uploader: {block.data.get('uploader_id')}")
+        print(f"   Block {block.index} | {block._ts_str} | {block.data.get('action')} | Uploader: {block.data.get('uploader_id')}")
 
     # Phase 8: Validate blockchain
     print("\n🔒 PHASE 8: Blockchain Validation")
@@ -515,9 +811,13 @@ def run_demo_simulation(blockchain: Blockchain, manager: FileIntegrityManager):
 
 # --- Main Entry Point ---
 if __name__ == "__main__":
+    # Turn SIGTERM into a normal exit so atexit flushes unsaved blocks
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
     print("\n" + "=" * 60)
     print("BLOCKCHAIN-BASED FILE INTEGRITY SYSTEM")
     print("=" * 60)
+    print(f"[🔐] Hash backend: {describe_hash_backend()}")
 
     security_chain = Blockchain(difficulty=MINING_DIFFICULTY)
 
@@ -0,0 +1,214 @@
+"""Numba-compiled proof-of-work nonce scanner.
+
+Runs SHA-256 over several candidate nonces at once (one lane per nonce) so
+the compiled loop can keep independent hash states in flight. Importing this
+module raises ImportError when numba/numpy are not installed; the miner in
+blockchain_file_integrity falls back to its pure-Python loop in that case.
+"""
+import hashlib
+
+import numpy as np
+from numba import njit
+
+LANES = 8  # Independent nonces hashed per batch
+BATCH_SIZE = 1 << 16  # Nonces tried per call into the kernel
+MASK = 0xFFFFFFFF  # Words are kept in int64 and masked back to 32 bits
+
+K = np.array([
+    0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+    0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+    0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+    0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+    0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+    0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+    0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+    0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2,
+], dtype=np.int64)
+
+H0 = np.array([
+    0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a, 0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19,
+], dtype=np.int64)
+
+
+@njit(cache=True, boundscheck=False)
+def _rotr(x, n):
+    return ((x >> n) | (x << (32 - n))) & MASK
+
+
+@njit(cache=True, boundscheck=False)
+def _padded_length(n):
+    """Length of an n-byte message after SHA-256 padding."""
+    return ((n + 8) // 64 + 1) * 64
+
+
+@njit(cache=True, boundscheck=False)
+def _write_message(buf, lane, prefix, suffix, nonce):
+    """Write prefix + decimal nonce + suffix, padded, into buf[lane]; return its length."""
+    n = 0
+    for i in range(prefix.shape[0]):
+        buf[lane, n] = prefix[i]
+        n += 1
+
+    digits = 1
+    t = nonce
+    while t >= 10:
+        t //= 10
+        digits += 1
+    t = nonce
+    for i in range(digits - 1, -1, -1):
+        buf[lane, n + i] = 48 + t % 10
+        t //= 10
+    n += digits
+
+    for i in range(suffix.shape[0]):
+        buf[lane, n] = suffix[i]
+        n += 1
+
+    total = _padded_length(n)
+    buf[lane, n] = 0x80
+    for i in range(n + 1, total):
+        buf[lane, i] = 0
+    bit_length = n * 8
+    for i in range(8):
+        buf[lane, total - 1 - i] = (bit_length >> (8 * i)) & 0xFF
+    return total
+
+
+@njit(cache=True, boundscheck=False)
+def _compress(state, buf, offset, live, w, v):
+    """Apply one SHA-256 compression to every live lane's 64-byte block at offset."""
+    for t in range(16):
+        j = offset + 4 * t
+        for lane in range(LANES):
+            w[t, lane] = ((np.int64(buf[lane, j]) << 24) | (np.int64(buf[lane, j + 1]) << 16)
+                          | (np.int64(buf[lane, j + 2]) << 8) | np.int64(buf[lane, j + 3]))
+    for t in range(16, 64):
+        for lane in range(LANES):
+            x = w[t - 15, lane]
+            y = w[t - 2, lane]
+            s0 = _rotr(x, 7) ^ _rotr(x, 18) ^ (x >> 3)
+            s1 = _rotr(y, 17) ^ _rotr(y, 19) ^ (y >> 10)
+            w[t, lane] = (w[t - 16, lane] + s0 + w[t - 7, lane] + s1) & MASK
+
+    for i in range(8):
+        for lane in range(LANES):
+            v[i, lane] = state[i, lane]
+
+    for t in range(64):
+        for lane in range(LANES):
+            a = v[0, lane]
+            b = v[1, lane]
+            c = v[2, lane]
+            d = v[3, lane]
+            e = v[4, lane]
+            f = v[5, lane]
+            g = v[6, lane]
+            h = v[7, lane]
+            s1 = _rotr(e, 6) ^ _rotr(e, 11) ^ _rotr(e, 25)
+            ch = (e & f) ^ (~e & g)
+            t1 = (h + s1 + ch + K[t] + w[t, lane]) & MASK
+            s0 = _rotr(a, 2) ^ _rotr(a, 13) ^ _rotr(a, 22)
+            maj = (a & b) ^ (a & c) ^ (b & c)
+            t2 = (s0 + maj) & MASK
+            v[7, lane] = g
+            v[6, lane] = f
+            v[5, lane] = e
+            v[4, lane] = (d + t1) & MASK
+            v[3, lane] = c
+            v[2, lane] = b
+            v[1, lane] = a
+            v[0, lane] = (t1 + t2) & MASK
+
+    for i in range(8):
+        for lane in range(LANES):
+            if live[lane]:
+                state[i, lane] = (state[i, lane] + v[i, lane]) & MASK
+
+
+@njit(cache=True, boundscheck=False)
+def _meets_difficulty(state, lane, difficulty):
+    """Check a lane's digest for `difficulty` leading zero hex digits."""
+    bits = 4 * difficulty
+    for i in range(8):
+        if bits <= 0:
+            return True
+        if bits >= 32:
+            if state[i, lane] != 0:
+                return False
+            bits -= 32
+        else:
+            return (state[i, lane] >> (32 - bits)) == 0
+    return True
+
+
+@njit(cache=True, boundscheck=False)
+def scan_nonces(prefix, suffix, start, count, difficulty):
+    """Try nonces start..start+count-1; return the first that meets difficulty, or -1."""
+    max_length = _padded_length(prefix.shape[0] + 20 + suffix.shape[0])
+    buf = np.zeros((LANES, max_length), dtype=np.uint8)
+    blocks = np.zeros(LANES, dtype=np.int64)
+    live = np.zeros(LANES, dtype=np.bool_)
+    state = np.zeros((8, LANES), dtype=np.int64)
+    w = np.zeros((64, LANES), dtype=np.int64)
+    v = np.zeros((8, LANES), dtype=np.int64)
+
+    end = start + count
+    for base in range(start, end, LANES):
+        max_blocks = 0
+        for lane in range(LANES):
+            blocks[lane] = _write_message(buf, lane, prefix, suffix, base + lane) // 64
+            if blocks[lane] > max_blocks:
+                max_blocks = blocks[lane]
+            for i in range(8):
+                state[i, lane] = H0[i]
+
+        # Lanes only differ in length when the batch crosses a power of ten
+        for block in range(max_blocks):
+            for lane in range(LANES):
+                live[lane] = block < blocks[lane]
+            _compress(state, buf, block * 64, live, w, v)
+
+        for lane in range(LANES):
+            if base + lane < end and _meets_difficulty(state, lane, difficulty):
+                return base + lane
+    return -1
+
+
+def find_nonce(prefix: bytes, suffix: bytes, difficulty: int, batch_size: int = BATCH_SIZE) -> int:
+    """Scan batches of nonces until sha256(prefix + nonce + suffix) meets difficulty."""
+    prefix_arr = np.frombuffer(prefix, dtype=np.uint8)
+    suffix_arr = np.frombuffer(suffix, dtype=np.uint8)
+    nonce_base = 0
+    while True:
+        nonce = scan_nonces(prefix_arr, suffix_arr, nonce_base, batch_size, difficulty)
+        if nonce >= 0:
+            return nonce
+        nonce_base += batch_size
+
+
+def self_check() -> bool:
+    """Compare scan_nonces with hashlib.sha256 on sample headers.
+
+    Covers prefixes shorter and longer than one 64-byte block and batches
+    whose nonces cross a power of ten. Running it also compiles the kernel,
+    so the JIT cost is not paid inside the first mine_block call.
+    """
+    cases = [
+        (b'{"data": {}, "index": 1, "nonce": ', b', "previous_hash": "00", "timestamp": 1.5}'),
+        (b'{"data": {"filename": "' + b"x" * 90 + b'", "file_size": 5}, "index": 42, "nonce": ',
+         b', "previous_hash": "' + b"ab" * 32 + b'", "timestamp": 1762014357.2071228}'),
+    ]
+    count = 4096
+    for prefix, suffix in cases:
+        prefix_arr = np.frombuffer(prefix, dtype=np.uint8)
+        suffix_arr = np.frombuffer(suffix, dtype=np.uint8)
+        for start, difficulty in ((0, 1), (5, 2), (95, 1), (995, 2)):
+            expected = -1
+            for nonce in range(start, start + count):
+                digest = hashlib.sha256(prefix + str(nonce).encode() + suffix).hexdigest()
+                if digest.startswith("0" * difficulty):
+                    expected = nonce
+                    break
+            if scan_nonces(prefix_arr, suffix_arr, start, count, difficulty) != expected:
+                return False
+    return True
@@ -1,12 +1,14 @@
 from flask import Flask, jsonify, request, send_from_directory
 from flask_cors import CORS
-import os, threading, webbrowser, json
+import os, signal, sys, threading, webbrowser, json
+import orjson
 from datetime import datetime
 
 # MongoDB
 from pymongo import MongoClient
+from pymongo.errors import OperationFailure, PyMongoError
 from werkzeug.security import generate_password_hash, check_password_hash
-from blockchain_file_integrity import Blockchain, FileIntegrityManager
+from blockchain_file_integrity import Blockchain, FileIntegrityManager, describe_hash_backend
 
 app = Flask(__name__, static_folder="../frontend")
 CORS(app)
@@ -24,6 +26,16 @@ if not os.path.exists(USERS_FILE):
             {"username":"user2","password":"password2"},
         ], f, indent=2)
 
+# users.json is only a bootstrap/fallback source, so read it once at startup
+try:
+    with open(USERS_FILE, "r", encoding="utf-8") as f:
+        _FILE_USERS = json.load(f)
+except Exception as _e:
+    print("[⚠️] Could not read users.json:", _e)
+    _FILE_USERS = []
+_FALLBACK_USERS = frozenset((x.get("username"), x.get("password")) for x in _FILE_USERS)
+_FALLBACK_USERNAMES = frozenset(x.get("username") for x in _FILE_USERS)
+
 # ---- Mongo configuration (use env vars in production) ----
 MONGO_URI = os.environ.get("MONGO_URI", "mongodb://localhost:27017")
 MONGO_DB = os.environ.get("MONGO_DB", "blockchain_app")
@@ -33,25 +45,49 @@ db = client[MONGO_DB]
 users_col = db.get_collection("users")
 files_col = db.get_collection("files")
 
-# If there's an existing users.json file, migrate accounts to MongoDB (only when collection empty)
+# Check reachability once so an unavailable server costs a single selection timeout at startup
 try:
-    if os.path.exists(USERS_FILE) and users_col.count_documents({}) == 0:
-        with open(USERS_FILE, "r", encoding="utf-8") as f:
-            current_users = json.load(f)
-        migrated = 0
-        for u in current_users:
-            username = u.get("username")
-            password = u.get("password")
-            if username and password and not users_col.find_one({"username": username}):
-                users_col.insert_one({
-                    "username": username,
-                    "password": generate_password_hash(password)
-                })
-                migrated += 1
-        if migrated:
-            print(f"[📦] Migrated {migrated} users from users.json to MongoDB ({MONGO_DB}.users)")
-except Exception as _e:
-    print("[⚠️] MongoDB migration skipped or failed:", _e)
+    client.admin.command("ping")
+    _mongo_up = True
+except PyMongoError as _e:
+    print("[⚠️] MongoDB unreachable, skipping index creation and user migration:", _e)
+    _mongo_up = False
+
+if _mongo_up:
+    # Index the per-request lookups; create_index is a no-op for indexes that already exist
+    try:
+        for _col, _keys, _opts in (
+            (users_col, [("username", 1)], {"unique": True}),
+            (files_col, [("file_hash", 1)], {}),
+            (files_col, [("uploader_id", 1), ("registered_at", -1)], {}),
+        ):
+            try:
+                _col.create_index(_keys, **_opts)
+            except OperationFailure as _e:
+                # e.g. duplicate usernames block the unique index; the other indexes still apply
+                print(f"[⚠️] MongoDB index on {_col.name} {_keys} failed:", _e)
+    except PyMongoError as _e:
+        print("[⚠️] MongoDB indexes skipped:", _e)
+
+    # If there's an existing users.json file, migrate accounts to MongoDB (only when collection empty)
+    try:
+        if _FILE_USERS and users_col.count_documents({}) == 0:
+            migrated = 0
+            for u in _FILE_USERS:
+                username = u.get("username")
+                password = u.get("password")
+                if username and password and not users_col.find_one({"username": username}):
+                    users_col.insert_one({
+                        "username": username,
+                        "password": generate_password_hash(password)
+                    })
+                    migrated += 1
+            if migrated:
+                print(f"[📦] Migrated {migrated} users from users.json to MongoDB ({MONGO_DB}.users)")
+    except Exception as _e:
+        print("[⚠️] MongoDB migration skipped or failed:", _e)
+
+print(f"[🔐] Hash backend: {describe_hash_backend()}")
 
 blockchain = Blockchain()
 if not blockchain.load_chain():
@@ -59,6 +95,10 @@ if not blockchain.load_chain():
     blockchain.save_chain()
 file_manager = FileIntegrityManager(blockchain)
 
+def ojsonify(obj):
+    """jsonify() replacement that serializes with orjson for large payloads."""
+    return app.response_class(orjson.dumps(obj), mimetype="application/json")
+
 @app.route("/")
 def serve_login():
     return send_from_directory("../frontend", "login.html")
@@ -87,9 +127,7 @@ def login_user():
                 return jsonify({"success": False, "message": "❌ Invalid username or password."})
 
         # Fallback to file-based users.json if not found in DB (keeps backward compatibility)
-        with open(USERS_FILE, "r", encoding="utf-8") as f:
-            users = json.load(f)
-        ok = any(x["username"] == u and x["password"] == pw for x in users)
+        ok = (u, pw) in _FALLBACK_USERS
         return jsonify({"success": ok, "message": "✅ Login successful!" if ok else "❌ Invalid username or password."})
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
@@ -106,15 +144,9 @@ def register_user():
         if users_col.find_one({"username": u}):
             return jsonify({"success": False, "message":"⚠️ Username already exists."})
 
-        # Also check users.json for compatibility (if present)
-        try:
-            if os.path.exists(USERS_FILE):
-                with open(USERS_FILE, "r", encoding="utf-8") as f:
-                    users = json.load(f)
-                if any(x["username"] == u for x in users):
-                    return jsonify({"success": False, "message": "⚠️ Username already exists."})
-        except Exception:
-            pass
+        # Also check users.json for compatibility
+        if u in _FALLBACK_USERNAMES:
+            return jsonify({"success": False, "message": "⚠️ Username already exists."})
 
         # Store hashed password in MongoDB
         users_col.insert_one({"username": u, "password": generate_password_hash(pw), "created_at": datetime.now().isoformat()})
@@ -129,24 +161,20 @@ def register_file():
         uploader_id = request.form.get("uploader_id","anonymous").strip()
         path = os.path.join(UPLOAD_FOLDER, f.filename)
         f.save(path)
-        ok = file_manager.register_file(path, uploader_id, "FILE_REGISTERED")
-        blockchain.save_chain()
-
-        # store metadata in MongoDB (if available)
-        try:
-            file_hash = file_manager.get_file_hash(path)
-            metadata = file_manager.get_file_metadata(path) or {}
-            files_col.insert_one({
-                "filename": f.filename,
-                "filepath": path,
-                "uploader_id": uploader_id,
-                "action": "FILE_REGISTERED",
-                "file_hash": file_hash,
-                "file_size": metadata.get("size"),
-                "registered_at": datetime.now().isoformat()
-            })
-        except Exception as _e:
-            print("[⚠️] Storing file metadata in MongoDB failed:", _e)
+        file_data = file_manager.register_file(path, uploader_id, "FILE_REGISTERED")
+        ok = file_data is not None
+
+        # store metadata in MongoDB (if available), reusing the hash and size recorded in the block
+        if ok:
+            try:
+                files_col.insert_one({
+                    **file_data,
+                    "filename": f.filename,
+                    "filepath": path,
+                    "registered_at": datetime.now().isoformat()
+                })
+            except Exception as _e:
+                print("[⚠️] Storing file metadata in MongoDB failed:", _e)
 
         return jsonify({"success": ok, "message": f"✅ {f.filename} registered successfully!" if ok else "❌ Registration failed."})
     except Exception as e:
@@ -163,16 +191,43 @@ def verify_file():
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
+@app.route("/verify_batch", methods=["POST"])
+def verify_batch():
+    try:
+        files = request.files.getlist("files")
+        paths = []
+        for f in files:
+            path = os.path.join(UPLOAD_FOLDER, f.filename)
+            f.save(path)
+            paths.append(path)
+        results = file_manager.verify_many(paths)
+        return jsonify({
+            "success": bool(results) and all(results),
+            "results": [{"filename": f.filename, "verified": ok} for f, ok in zip(files, results)]
+        })
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
 @app.route("/validate", methods=["GET"])
 def validate_chain():
-    ok = blockchain.is_valid()
+    if request.args.get("full") == "1":
+        ok = blockchain.is_valid(recompute=True)
+    else:
+        ok = blockchain.is_valid_incremental()
     return jsonify({"success": ok, "message":"✅ Blockchain valid — no corruption found." if ok else "❌ Blockchain corrupted!"})
 
 @app.route("/history", methods=["GET"])
 def history_all():
     try:
-        with open(os.path.join(BASE,"blockchain_data.json"),"r") as f:
-            return jsonify(json.load(f))
+        # The chain only ever grows, so its length and tip identify its contents
+        latest = blockchain.get_latest_block()
+        etag = f"{len(blockchain.chain)}-{latest.hash if latest else ''}"
+        if request.if_none_match.contains(etag):
+            response = app.response_class(status=304)
+        else:
+            response = ojsonify({"difficulty": blockchain.difficulty, "blocks": blockchain.get_serialized_blocks()})
+        response.set_etag(etag)
+        return response
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -194,7 +249,7 @@ def history_user():
                 "file_size": d.get("file_size"),
                 "timestamp": b.timestamp
             })
-    return jsonify({"success": True, "count": len(blocks), "blocks": blocks})
+    return ojsonify({"success": True, "count": len(blocks), "blocks": blocks})
 
 @app.route("/demo", methods=["GET"])
 def demo():
@@ -204,5 +259,7 @@ def open_frontend():
     webbrowser.open_new("http://127.0.0.1:5000")
 
 if __name__ == "__main__":
+    # Turn SIGTERM (docker stop, systemd) into a normal exit so atexit flushes unsaved blocks
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
     threading.Timer(1.0, open_frontend).start()
     app.run(host="127.0.0.1", port=5000, debug=False)